@@ -10,59 +10,190 @@ Refer to `taskmaster-gitlab-gantt-spec.md` for detailed specifications.
 """
 
 import argparse
+import atexit
+import hashlib
+import itertools
 import json
 import os
 import re
 import sys
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, timedelta
 from pathlib import Path
+from types import SimpleNamespace
+from urllib.parse import urlparse
 
-import gitlab
-import holidays
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
+import numpy as np
 from dotenv import dotenv_values, find_dotenv
-from vibelogger import VibeLoggerConfig, create_logger
+from vibelogger import VibeLogger, VibeLoggerConfig
+
+try:
+    import orjson
+except ImportError:  # orjson has no wheel for some platforms; fall back to the standard json module
+    orjson = None
+
+# gitlab, holidays, pandas and plotly are slow to import, so they are imported inside the functions
+# that use them. This keeps `--help` and configuration errors responsive.
 
 # --- Constants & Settings ---
 # TASKS_PATH = Path("/workspace/.taskmaster/tasks/tasks.json") # Moved to main
 # DEFAULT_OUTPUT_HTML_PATH = Path("/workspace/gantt_chart.html") # Moved to main
 
 # --- Logger Setup ---
-# Configure VibeLogger to save logs to a file and keep them in memory for AI analysis
+# Configure VibeLogger to keep logs in memory for AI analysis. Entries are not written one by one
+# (auto_save opens and appends to the file on every call); flush_logs() writes them in batches instead.
+LOG_MEMORY_LIMIT = 1000  # VibeLogger keeps the most recent entries in memory and drops older ones
+LOG_FLUSH_THRESHOLD = 500  # Unwritten entries that trigger a flush, well before they could be dropped
 vibe_config = VibeLoggerConfig(
     log_file="./logs/tmgantt_vibe.log",  # Specify a log file path
     max_file_size_mb=10,  # Max 10MB per log file
-    auto_save=True,
+    auto_save=False,
     keep_logs_in_memory=True,
-    max_memory_logs=1000,  # Keep last 1000 logs in memory
+    max_memory_logs=LOG_MEMORY_LIMIT,
 )
-logger = create_logger(config=vibe_config)
+
+
+class BufferedVibeLogger(VibeLogger):
+    """VibeLogger that writes its entries to the log file in batches of LOG_FLUSH_THRESHOLD.
+
+    The in-memory history (`logs`) is kept as in VibeLogger; flush_logs() only tracks which entries were written.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.last_flushed_entry = None
+        self.num_unflushed = 0
+
+    def _process_entry(self, entry):
+        super()._process_entry(entry)
+        self.num_unflushed += 1
+        if self.num_unflushed >= LOG_FLUSH_THRESHOLD:
+            flush_logs()
+
+
+logger = BufferedVibeLogger(config=vibe_config)
+
+# GraphQL query used to fetch only the issue fields the chart needs, 100 issues per request.
+ISSUES_GRAPHQL_QUERY = """
+query($fullPath: ID!, $after: String, $updatedAfter: Time) {
+  project(fullPath: $fullPath) {
+    issues(first: 100, after: $after, updatedAfter: $updatedAfter) {
+      pageInfo { endCursor hasNextPage }
+      nodes { iid title dueDate closedAt createdAt updatedAt description }
+    }
+  }
+}
+"""
+
+# Markdown task list item in an issue description, e.g. "- [x] Write tests"
+TASK_ITEM_RE = re.compile(r"^[ \t]*- \[([ |x])\] (.*)$", re.MULTILINE)
+# Taskmaster task ID prefix in a GitLab issue title, e.g. "1.2: Title"
+ISSUE_TITLE_RE = re.compile(r"^([0-9\.]+):")
+ISSUE_TITLE_FIRST_CHARS = frozenset("0123456789.")
+
+# Suffix of the file next to the chart output that stores the hash of the chart inputs
+CHART_HASH_SUFFIX = ".sha"
+
+# Columns of the DataFrame built by prepare_gantt_data
+GANTT_COLUMNS = ["Task", "Start", "Finish", "Status", "Color", "TaskID"]
+
+# Bar colors per Taskmaster status; statuses not listed here use UNKNOWN_STATUS_COLOR
+COLOR_MAP = {
+    "done": "#28a745",
+    "in-progress": "#fd7e14",
+    "pending": "#007bff",
+    "blocked": "#dc3545",
+    "unknown": "#6c757d",
+}
+UNKNOWN_STATUS_COLOR = "#6c757d"
+SUBTASK_COLOR = "#A0A0A0"  # Subtasks parsed from issue descriptions are gray
+
+# Dates of a GitLab issue parsed once after fetching; each field is a date or None
+IssueDates = namedtuple("IssueDates", ["created", "closed", "due"])
+
+# --- Issue Cache Settings ---
+ISSUE_CACHE_DIR = Path.home() / ".cache" / "tmgantt"
+ISSUE_CACHE_TTL_SECONDS = 3600  # Reuse the cache without contacting GitLab for 1 hour
+REST_ISSUES_PER_PAGE = 100  # Maximum page size of the REST API
+REST_PAGE_WORKERS = 8  # Concurrent page requests when falling back to the REST API
+ISSUE_FIELDS = ("iid", "title", "due_date", "closed_at", "created_at", "updated_at", "description")
+
+
+def flush_logs():
+    """Appends the log entries not written yet to the log file in a single write.
+
+    The entries stay in `logger.logs`, VibeLogger's in-memory history of the last LOG_MEMORY_LIMIT entries.
+    """
+    with logger._logs_lock:  # Entries may be logged from other threads meanwhile
+        # Entries after the newest written one are new. If that entry has left the history, so have all older ones.
+        start = next((i + 1 for i in range(len(logger.logs) - 1, -1, -1) if logger.logs[i] is logger.last_flushed_entry), 0)
+        entries = logger.logs[start:]
+        if entries:
+            logger.last_flushed_entry = entries[-1]
+        logger.num_unflushed = 0
+    if not entries or not vibe_config.log_file:
+        return
+    try:
+        Path(vibe_config.log_file).parent.mkdir(parents=True, exist_ok=True)
+        logger._rotate_log_if_needed()  # VibeLogger's size-based rotation (max_file_size_mb)
+        with open(vibe_config.log_file, "a", encoding="utf-8") as f:
+            f.write("".join(entry.to_json() + "\n" for entry in entries))
+    except OSError as e:
+        print(f"Failed to save log to file: {e}", file=sys.stderr)
+
+
+# The rest of the buffer is written when the interpreter exits, including on sys.exit() and uncaught errors,
+# also when this module is imported rather than run through main()
+atexit.register(flush_logs)
+
+
+def is_debug_logging_enabled():
+    """Returns True if debug log entries should be recorded (`--log-level DEBUG`)."""
+    return vibe_config.log_level == "DEBUG"
 
 
 # --- Data Acquisition & Processing Modules ---
 
 
+def read_json_file(path):
+    """Reads and parses a JSON file, using orjson when it is available.
+
+    Both parsers raise a json.JSONDecodeError (orjson's error is a subclass of it) on malformed input.
+    """
+    if orjson is not None:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_json_file(path, data):
+    """Serializes data to a UTF-8 JSON file, using orjson when it is available."""
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(data))
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+
+
 def load_taskmaster_tasks(tag="master"):
     """Loads and flattens tasks from the Taskmaster JSON file."""
     all_tasks = {}
     try:
         # TASKS_PATH is now passed as an argument or defined locally
         tasks_path = Path("/workspace/.taskmaster/tasks/tasks.json")
-        with open(tasks_path, "r", encoding="utf-8") as f:
-            tasks_data = json.load(f)
+        tasks_data = read_json_file(tasks_path)
 
         if tag in tasks_data and "tasks" in tasks_data[tag]:
-
-            def flatten(tasks_list, parent_id=None):
-                for task in tasks_list:
-                    current_id = f"{parent_id}.{task['id']}" if parent_id else str(task["id"])
-                    all_tasks[current_id] = task
-                    if "subtasks" in task and task.get("subtasks"):
-                        flatten(task["subtasks"], current_id)
-
-            flatten(tasks_data[tag]["tasks"])
+            # Iterative pre-order walk; items are pushed in reverse so they are popped in file order
+            stack = [(str(task["id"]), task) for task in reversed(tasks_data[tag]["tasks"])]
+            while stack:
+                current_id, task = stack.pop()
+                all_tasks[current_id] = task
+                stack.extend((f"{current_id}.{subtask['id']}", subtask) for subtask in reversed(task.get("subtasks") or ()))
             logger.info(
                 operation="load_taskmaster_tasks",
                 message=f"Successfully loaded {len(all_tasks)} tasks from Taskmaster.",
@@ -95,20 +226,188 @@ def load_taskmaster_tasks(tag="master"):
     return all_tasks
 
 
-def get_gitlab_issues(gl, project_id):
-    """Fetches all issues from the specified GitLab project."""
+def fetch_issues_graphql(gl, full_path, updated_after=None):
+    """Fetches issues of a project via the GraphQL API using cursor pagination.
+
+    Returns lightweight objects exposing the same attributes as python-gitlab issues
+    (`iid`, `title`, `due_date`, `closed_at`, `created_at`, `updated_at`, `description`).
+    If `updated_after` is given, only issues updated since that timestamp are fetched.
+    """
+    import gitlab
+
+    issues = []
+    cursor = None
+    while True:
+        variables = {"fullPath": full_path, "after": cursor, "updatedAfter": updated_after}
+        result = gl.http_post(f"{gl.url}/api/graphql", post_data={"query": ISSUES_GRAPHQL_QUERY, "variables": variables})
+        if result.get("errors"):
+            raise gitlab.exceptions.GitlabError(f"GraphQL query failed: {result['errors']}")
+        project = result["data"]["project"]
+        if project is None:
+            raise gitlab.exceptions.GitlabError(f"GraphQL project not found: {full_path}")
+        connection = project["issues"]
+        for node in connection["nodes"]:
+            issues.append(
+                SimpleNamespace(
+                    iid=int(node["iid"]),
+                    title=node["title"],
+                    # GraphQL types dueDate as Time ("2025-04-20T00:00:00Z"); REST returns the plain date
+                    due_date=node["dueDate"][:10] if node["dueDate"] else None,
+                    closed_at=node["closedAt"],
+                    created_at=node["createdAt"],
+                    updated_at=node["updatedAt"],
+                    description=node["description"],
+                )
+            )
+        if not connection["pageInfo"]["hasNextPage"]:
+            break
+        cursor = connection["pageInfo"]["endCursor"]
+    return issues
+
+
+def fetch_issues_rest(project, updated_after=None):
+    """Fetches issues of a project via the REST API, 100 issues per page.
+
+    The first page reports the total number of pages, so the remaining pages are requested concurrently.
+    GitLab omits the total for very large result sets; the pages are then followed one by one.
+    """
+    filters = {"updated_after": updated_after} if updated_after else {}
+    first_page = project.issues.list(iterator=True, per_page=REST_ISSUES_PER_PAGE, **filters)
+    total_pages = first_page.total_pages
+    if not total_pages or total_pages <= 1:
+        return list(first_page)
+
+    # Only the items of the first page are read, so iterating does not request the next page
+    issues = list(itertools.islice(first_page, REST_ISSUES_PER_PAGE))
+    with ThreadPoolExecutor(max_workers=REST_PAGE_WORKERS) as executor:
+        pages = executor.map(
+            lambda page: project.issues.list(page=page, per_page=REST_ISSUES_PER_PAGE, get_all=False, **filters),
+            range(2, total_pages + 1),
+        )
+        for page_issues in pages:
+            issues.extend(page_issues)
+    return issues
+
+
+def get_issue_cache_path(gitlab_url, project_id):
+    """Returns the cache file of a project, keyed by GitLab host and project ID or path."""
+    # Project paths such as "group/project" and host ports are flattened into a single file name
+    cache_key = re.sub(r"[^A-Za-z0-9._-]", "_", f"{urlparse(gitlab_url).netloc}_{project_id}")
+    return ISSUE_CACHE_DIR / f"{cache_key}.json"
+
+
+def load_issue_cache(cache_path):
+    """Loads cached issue records from disk. Returns None if the cache is missing, unreadable or malformed."""
+    try:
+        cache = read_json_file(cache_path)
+    except FileNotFoundError:
+        return None
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(
+            operation="load_issue_cache",
+            message=f"Ignoring unreadable issue cache {cache_path}: {e}",
+            context={"cache_path": str(cache_path), "error": str(e)},
+        )
+        return None
+    # The file is valid JSON, but it may not be a cache written by save_issue_cache
+    if not (
+        isinstance(cache, dict)
+        and isinstance(cache.get("project_name"), str)
+        and isinstance(cache.get("issues"), list)
+        and all(isinstance(record, dict) and record.keys() >= set(ISSUE_FIELDS) for record in cache["issues"])
+    ):
+        logger.warning(
+            operation="load_issue_cache",
+            message=f"Ignoring malformed issue cache {cache_path}",
+            context={"cache_path": str(cache_path)},
+        )
+        return None
+    return cache
+
+
+def save_issue_cache(cache_path, project_name, issues):
+    """Saves the fields of the given issues used by the chart to the cache file."""
+    records = [{field: getattr(issue, field, None) for field in ISSUE_FIELDS} for issue in issues]
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        write_json_file(cache_path, {"project_name": project_name, "issues": records})
+        if is_debug_logging_enabled():
+            logger.debug(
+                operation="save_issue_cache",
+                message=f"Saved {len(records)} issues to cache: {cache_path}",
+                context={"cache_path": str(cache_path), "num_issues": len(records)},
+            )
+    except OSError as e:
+        logger.warning(
+            operation="save_issue_cache",
+            message=f"Failed to write issue cache {cache_path}: {e}",
+            context={"cache_path": str(cache_path), "error": str(e)},
+        )
+
+
+def get_gitlab_issues(gl, project_id, use_cache=True):
+    """Fetches all issues from the specified GitLab project.
+
+    Uses a bulk GraphQL query and falls back to the paginated REST API if GraphQL is unavailable.
+    Issues are cached on disk per project: a cache younger than ISSUE_CACHE_TTL_SECONDS is used as is,
+    an older one is refreshed by fetching only the issues updated since the last run.
+    """
+    import gitlab
+
     issues = []
     project_name = "Unknown Project"
+    cache_path = get_issue_cache_path(gl.url, project_id)
+    cache = load_issue_cache(cache_path) if use_cache else None
+
+    if cache and time.time() - cache_path.stat().st_mtime < ISSUE_CACHE_TTL_SECONDS:
+        issues = [SimpleNamespace(**record) for record in cache["issues"]]
+        logger.info(
+            operation="get_gitlab_issues",
+            message=f"Loaded {len(issues)} issues from cache: {cache_path}",
+            context={"num_issues": len(issues), "cache_path": str(cache_path)},
+        )
+        return issues, cache["project_name"]
+
     try:
+        # Authentication is deferred to here, so a fresh cache is used without contacting GitLab at all
+        gl.auth()
+        logger.info(operation="get_gitlab_issues", message="Successfully authenticated with GitLab.")
         project = gl.projects.get(project_id)
         project_name = project.name_with_namespace  # Get project name
         logger.info(operation="get_gitlab_issues", message=f"Accessing GitLab project: '{project_name}'")
-        issues = project.issues.list(all=True)
+
+        updated_after = None
+        if cache:
+            updated_after = max((record["updated_at"] for record in cache["issues"] if record["updated_at"]), default=None)
+        if updated_after:
+            logger.info(
+                operation="get_gitlab_issues",
+                message=f"Fetching issues updated since {updated_after}",
+                context={"updated_after": updated_after},
+            )
+
+        try:
+            fetched = fetch_issues_graphql(gl, project.path_with_namespace, updated_after)
+        except (gitlab.exceptions.GitlabError, KeyError, TypeError) as e:
+            logger.warning(
+                operation="get_gitlab_issues",
+                message=f"GraphQL issue fetch failed, falling back to REST API: {e}",
+                context={"error": str(e)},
+            )
+            fetched = fetch_issues_rest(project, updated_after)
         logger.info(
             operation="get_gitlab_issues",
-            message=f"Successfully fetched {len(issues)} issues from GitLab.",
-            context={"num_issues": len(issues)},
+            message=f"Successfully fetched {len(fetched)} issues from GitLab.",
+            context={"num_issues": len(fetched)},
         )
+
+        # Merge the fetched issues into the cached ones, newer data wins. Both APIs list issues newest first;
+        # sorting by iid the same way keeps the order (and so map_tasks_and_issues' result) independent of the cache.
+        issues_by_iid = {record["iid"]: SimpleNamespace(**record) for record in cache["issues"]} if updated_after else {}
+        for issue in fetched:
+            issues_by_iid[issue.iid] = issue
+        issues = sorted(issues_by_iid.values(), key=lambda issue: issue.iid, reverse=True)
+        save_issue_cache(cache_path, project_name, issues)
     except gitlab.exceptions.GitlabError as e:
         logger.error(
             operation="get_gitlab_issues", message=f"GitLab API error while fetching issues: {e}", context={"error": str(e)}
@@ -119,73 +418,125 @@ def get_gitlab_issues(gl, project_id):
             message=f"An unexpected error occurred while fetching GitLab issues: {e}",
             context={"error": str(e)},
         )
+    if not issues and cache:
+        # The refresh of a stale cache failed; its issues are still better than charting none
+        issues = [SimpleNamespace(**record) for record in cache["issues"]]
+        project_name = cache["project_name"]
+        logger.warning(
+            operation="get_gitlab_issues",
+            message=f"Refreshing the issue cache failed. Using {len(issues)} stale cached issues from {cache_path}",
+            context={"num_issues": len(issues), "cache_path": str(cache_path)},
+        )
     return issues, project_name  # Return project_name as well
 
 
 def map_tasks_and_issues(gitlab_issues):
     """Creates a mapping from Taskmaster task ID to GitLab issue object."""
-    mapping = {}
-    for issue in gitlab_issues:
-        match = re.match(r"^([0-9\.]+):", issue.title)
-        if match:
-            mapping[match.group(1)] = issue
-    logger.debug(
-        operation="map_tasks_and_issues",
-        message=f"Mapped {len(mapping)} GitLab issues to Taskmaster IDs.",
-        context={"num_mapped_issues": len(mapping)},
-    )
+    # Titles that cannot start with a task ID are rejected with a cheap first-character check before the regex
+    mapping = {
+        match.group(1): issue
+        for issue in gitlab_issues
+        if issue.title[:1] in ISSUE_TITLE_FIRST_CHARS and (match := ISSUE_TITLE_RE.match(issue.title))
+    }
+    if is_debug_logging_enabled():
+        logger.debug(
+            operation="map_tasks_and_issues",
+            message=f"Mapped {len(mapping)} GitLab issues to Taskmaster IDs.",
+            context={"num_mapped_issues": len(mapping)},
+        )
     return mapping
 
 
-def is_working_day(d: date, country_holidays) -> bool:
-    """Checks if a given date is a working day (not a weekend or a holiday)."""
-    return d.weekday() < 5 and d not in country_holidays
+def parse_issue_dates(task_id_to_issue):
+    """Parses created_at, closed_at and due_date of every mapped GitLab issue into dates, once per issue."""
+    # GitLab timestamps are ISO 8601 strings whose first 10 characters are the date
+    return {
+        tm_id: IssueDates(
+            created=date.fromisoformat(issue.created_at[:10]) if issue.created_at else None,
+            closed=date.fromisoformat(issue.closed_at[:10]) if issue.closed_at else None,
+            due=date.fromisoformat(issue.due_date) if issue.due_date else None,
+        )
+        for tm_id, issue in task_id_to_issue.items()
+    }
 
 
-def get_next_working_day(d: date, country_holidays) -> date:
-    """Returns the next working day after a given date."""
-    next_day = d + timedelta(days=1)
-    while not is_working_day(next_day, country_holidays):
-        next_day += timedelta(days=1)
-    return next_day
+def get_non_working_periods(start: date, end: date, holiday_days):
+    """Returns (first_day, day_after_last_day) pairs for every run of consecutive non-working days in [start, end].
+
+    A weekend followed by a Monday holiday, for example, is returned as a single three-day period.
+    """
+    days = np.arange(start, end + timedelta(days=1), dtype="datetime64[D]")
+    # np.is_busday evaluates the Mon-Fri week mask and the holiday list in native code for all days at once
+    non_working = ~np.is_busday(days, holidays=holiday_days)
+    # Run boundaries come in (start, end) pairs where end is exclusive
+    boundaries = np.flatnonzero(np.diff(np.concatenate(([0], non_working.astype(np.int8), [0]))))
+    return [
+        (days[run_start].item(), days[run_end - 1].item() + timedelta(days=1))
+        for run_start, run_end in zip(boundaries[::2], boundaries[1::2])
+    ]
 
 
 def parse_task_list(description):
     """
     Parses Markdown task lists from a description string.
     """
-    if not description:
+    # Most descriptions contain no task list at all; a substring check is far cheaper than running the regex
+    if not description or "- [" not in description:
         return []
-    task_item_pattern = re.compile(r"^[ \t]*- \[([ |x])\] (.*)$", re.MULTILINE)
-    tasks = []
-    for line in description.splitlines():
-        match = task_item_pattern.match(line)
-        if match:
-            completed = match.group(1).lower() == "x"
-            title = match.group(2).strip()
-            tasks.append({"title": title, "completed": completed})
-    return tasks
-
-
-def prepare_gantt_data(taskmaster_tasks, task_id_to_issue, overall_start_date, country_holidays):
-    """Prepares and processes data into a pandas DataFrame for Plotly using ASAP scheduling."""
+    return [
+        {"title": match.group(2).strip(), "completed": match.group(1).lower() == "x"}
+        for match in TASK_ITEM_RE.finditer(description)
+    ]
+
+
+def get_dependency_cycle(tm_id, in_degree, task_dependencies, dependents):
+    """Returns the unscheduled tasks on a dependency cycle through tm_id, or an empty set if there is none.
+
+    A task is unscheduled while its entry in `in_degree` is positive. The cycle members are the tasks that
+    both depend on tm_id and are depended on by it, directly or transitively.
+    """
+
+    def reachable(neighbors):
+        seen = set()
+        stack = [tm_id]
+        while stack:
+            for next_id in neighbors[stack.pop()]:
+                if next_id not in seen and in_degree[next_id] > 0:
+                    seen.add(next_id)
+                    stack.append(next_id)
+        return seen
+
+    downstream = reachable(dependents)
+    if tm_id not in downstream:
+        return set()
+    return downstream & reachable(task_dependencies)
+
+
+def prepare_gantt_data(taskmaster_tasks, task_id_to_issue, overall_start_date, holiday_days, issue_dates=None):
+    """Prepares and processes data into a pandas DataFrame for Plotly using ASAP scheduling.
+
+    `holiday_days` is the sorted datetime64[D] array of holidays built in `main`.
+    `issue_dates` is the result of `parse_issue_dates(task_id_to_issue)`; it is computed here if not given.
+    """
+    import pandas as pd
+
     df_data = []
     today = datetime.now().date()
+    # Checked once: building the per-task debug messages is wasted work unless they are recorded
+    debug_logging = is_debug_logging_enabled()
+    if issue_dates is None:
+        issue_dates = parse_issue_dates(task_id_to_issue)
 
     # --- Initial Date Determination ---
     # Find the earliest created_at among all GitLab issues if overall_start_date is not set
     earliest_created_at = None
     if not overall_start_date:
-        for issue in task_id_to_issue.values():
-            if issue and issue.created_at:
-                issue_created_at = datetime.fromisoformat(issue.created_at).date()
-                if earliest_created_at is None or issue_created_at < earliest_created_at:
-                    earliest_created_at = issue_created_at
+        earliest_created_at = min((dates.created for dates in issue_dates.values() if dates.created), default=None)
         if earliest_created_at:
             logger.info(
                 operation="prepare_gantt_data",
                 message=f"No overall_start_date. Using earliest GitLab issue created_at: {earliest_created_at}",
-                context={"earliest_created_at": str(earliest_created_at)},
+                context={"earliest_created_at": earliest_created_at.isoformat()},
             )
         else:
             logger.warning(
@@ -193,118 +544,160 @@ def prepare_gantt_data(taskmaster_tasks, task_id_to_issue, overall_start_date, c
                 message="Could not determine earliest created_at from GitLab issues. Falling back to today for initial start dates.",
             )
 
-    # Initialize task_dates with end_dates first
-    task_dates = {}
-    for tm_id, tm_task in taskmaster_tasks.items():
-        issue = task_id_to_issue.get(tm_id)
-        end_date = None
-
-        # Determine end_date
-        if tm_task.get("status") == "done" and issue and issue.closed_at:
-            end_date = datetime.fromisoformat(issue.closed_at).date()
-            logger.debug(
-                operation="prepare_gantt_data",
-                message=f"Task {tm_id}: Using closed_at for end_date: {end_date}",
-                context={"task_id": tm_id, "end_date": str(end_date), "source": "closed_at"},
-            )
-        elif issue and issue.due_date:
-            end_date = datetime.strptime(issue.due_date, "%Y-%m-%d").date()
-            logger.debug(
-                operation="prepare_gantt_data",
-                message=f"Task {tm_id}: Using due_date for end_date: {end_date}",
-                context={"task_id": tm_id, "end_date": str(end_date), "source": "due_date"},
-            )
-        else:
-            end_date = today + timedelta(days=7)  # Fallback
-            logger.debug(
-                operation="prepare_gantt_data",
-                message=f"Task {tm_id}: Using fallback end_date: {end_date}",
-                context={"task_id": tm_id, "end_date": str(end_date), "source": "fallback"},
-            )
-
-        task_dates[tm_id] = {"start": None, "end": end_date}
+    # --- Topological Order ---
+    # Dependencies on tasks that do not exist are ignored
+    task_dependencies = {
+        tm_id: [str(dep_id) for dep_id in tm_task.get("dependencies") or [] if str(dep_id) in taskmaster_tasks]
+        for tm_id, tm_task in taskmaster_tasks.items()
+    }
+    dependents = {tm_id: [] for tm_id in taskmaster_tasks}
+    for tm_id, dep_ids in task_dependencies.items():
+        for dep_id in dep_ids:
+            dependents[dep_id].append(tm_id)
+
+    # Kahn's algorithm, one level at a time: level 0 has no dependencies and every task in level k
+    # depends only on tasks in earlier levels, so its dependencies are finalized when it is scheduled.
+    in_degree = {tm_id: len(dep_ids) for tm_id, dep_ids in task_dependencies.items()}
+    levels = []
+    cyclic_tm_ids = set()
+    num_scheduled = 0
+    frontier = [tm_id for tm_id, degree in in_degree.items() if degree == 0]
+    while num_scheduled < len(taskmaster_tasks):
+        if not frontier:
+            # Every remaining task waits on a dependency cycle. A cycle that waits on nothing outside itself is
+            # broken at its lowest task ID, which is scheduled on its own; tasks that merely depend on the cycle
+            # keep waiting for it as usual.
+            remaining = [tm_id for tm_id, degree in in_degree.items() if degree > 0]
+            for tm_id in sorted(remaining, key=lambda x: [int(i) if i.isdigit() else i for i in x.split(".")]):
+                cycle = get_dependency_cycle(tm_id, in_degree, task_dependencies, dependents)
+                if cycle and all(
+                    dep_id in cycle or in_degree[dep_id] <= 0 for cycle_id in cycle for dep_id in task_dependencies[cycle_id]
+                ):
+                    break
+            cyclic_tm_ids |= cycle
+            in_degree[tm_id] = 0  # Its unscheduled dependencies now take it below zero, so it is not queued again
+            frontier = [tm_id]
+        levels.append(frontier)
+        num_scheduled += len(frontier)
+        next_frontier = []
+        for tm_id in frontier:
+            for dependent_id in dependents[tm_id]:
+                in_degree[dependent_id] -= 1
+                if in_degree[dependent_id] == 0:
+                    next_frontier.append(dependent_id)
+        frontier = next_frontier
+    if cyclic_tm_ids:
+        cyclic_tm_ids = sorted(cyclic_tm_ids, key=lambda x: [int(i) if i.isdigit() else i for i in x.split(".")])
+        logger.warning(
+            operation="prepare_gantt_data",
+            message=f"Circular dependencies detected among tasks {cyclic_tm_ids}. Breaking cycles at the lowest task ID.",
+            context={"task_ids": cyclic_tm_ids},
+        )
 
     # --- ASAP Scheduling Logic ---
-    # Process tasks in a topological order if possible, or iteratively until stable
-    # For simplicity, we'll iterate a few times to propagate dates
-    # A more robust solution would use a proper topological sort or critical path algorithm.
-
-    # Sort tasks by ID to ensure a somewhat consistent processing order,
-    # though true topological sort is better for complex dependencies.
-    sorted_tm_ids = sorted(
-        taskmaster_tasks.keys(),
-        key=lambda x: [int(i) if i.isdigit() else i for i in x.split(".")],
-    )
+    # Next working days are looked up in NumPy's business-day calendar (Mon-Fri minus holidays), built once
+    busday_calendar = np.busdaycalendar(holidays=holiday_days)
 
-    # Iterate multiple times to ensure all dependencies are resolved
-    for _ in range(len(sorted_tm_ids) * 2):  # Iterate enough times to propagate changes
-        for tm_id in sorted_tm_ids:
+    # Single pass in topological order, level by level: the end dates of all dependencies are final when a task
+    # is visited. Only the task a dependency cycle was broken at can have dependencies that are not scheduled yet.
+    task_dates = {}
+    for level in levels:
+        # A dependent task starts on the next working day after its latest dependency ends. These dates only
+        # depend on earlier levels, so they are resolved for the whole level with one busday_offset call.
+        max_dep_end_dates = {}
+        for tm_id in level:
+            if taskmaster_tasks[tm_id].get("status") != "done" and task_dependencies[tm_id]:
+                max_dep_end_date = max(
+                    (task_dates[dep_id]["end"] for dep_id in task_dependencies[tm_id] if dep_id in task_dates), default=None
+                )
+                if max_dep_end_date:
+                    max_dep_end_dates[tm_id] = max_dep_end_date
+        dep_based_starts = {}
+        if max_dep_end_dates:
+            next_working_days = np.busday_offset(
+                np.array(list(max_dep_end_dates.values()), dtype="datetime64[D]") + 1,
+                0,
+                roll="forward",
+                busdaycal=busday_calendar,
+            )
+            dep_based_starts = dict(zip(max_dep_end_dates, next_working_days.tolist()))
+
+        for tm_id in level:
             tm_task = taskmaster_tasks[tm_id]
-            current_task_info = task_dates[tm_id]
-            issue = task_id_to_issue.get(tm_id)
+            created_date, closed_date, due_date = issue_dates.get(tm_id, IssueDates(None, None, None))
+
+            # Determine end_date
+            if tm_task.get("status") == "done" and closed_date:
+                end_date = closed_date
+                if debug_logging:
+                    logger.debug(
+                        operation="prepare_gantt_data",
+                        message=f"Task {tm_id}: Using closed_at for end_date: {end_date}",
+                        context={"task_id": tm_id, "end_date": end_date.isoformat(), "source": "closed_at"},
+                    )
+            elif due_date:
+                end_date = due_date
+                if debug_logging:
+                    logger.debug(
+                        operation="prepare_gantt_data",
+                        message=f"Task {tm_id}: Using due_date for end_date: {end_date}",
+                        context={"task_id": tm_id, "end_date": end_date.isoformat(), "source": "due_date"},
+                    )
+            else:
+                end_date = today + timedelta(days=7)  # Fallback
+                if debug_logging:
+                    logger.debug(
+                        operation="prepare_gantt_data",
+                        message=f"Task {tm_id}: Using fallback end_date: {end_date}",
+                        context={"task_id": tm_id, "end_date": end_date.isoformat(), "source": "fallback"},
+                    )
 
             # --- 1. Handle 'done' tasks: their dates are fixed and should not be changed by ASAP logic ---
             if tm_task.get("status") == "done":
                 # Ensure start date is set based on created_at or inferred from closed_at
-                if issue and issue.created_at:
-                    current_task_info["start"] = datetime.fromisoformat(issue.created_at).date()
+                if created_date:
+                    start_date = created_date
                 else:
                     # Fallback if no created_at for done task
-                    current_task_info["start"] = current_task_info["end"] - timedelta(days=1)
+                    start_date = end_date - timedelta(days=1)
 
                 # Ensure done task's start date is not pushed beyond its end date (closed_at)
-                if current_task_info["start"] > current_task_info["end"]:
-                    current_task_info["start"] = current_task_info["end"]
+                if start_date > end_date:
+                    start_date = end_date
                     logger.warning(
                         operation="prepare_gantt_data",
-                        message=f"Task {tm_id} (done): Adjusted start date to be <= end date: {current_task_info['start']}",
-                        context={
-                            "task_id": tm_id,
-                            "start_date": str(current_task_info["start"]),
-                            "end_date": str(current_task_info["end"]),
-                        },
+                        message=f"Task {tm_id} (done): Adjusted start date to be <= end date: {start_date}",
+                        context={"task_id": tm_id, "start_date": start_date.isoformat(), "end_date": end_date.isoformat()},
                     )
                 # If start and end dates are the same for a done task, extend end date by 1 day for visibility
-                if current_task_info["start"] == current_task_info["end"]:
-                    current_task_info["end"] = current_task_info["end"] + timedelta(days=1)
-                    logger.debug(
-                        operation="prepare_gantt_data",
-                        message=f"Task {tm_id} (done): End date adjusted by 1 day for visibility: {current_task_info['end']}",
-                        context={
-                            "task_id": tm_id,
-                            "start_date": str(current_task_info["start"]),
-                            "end_date": str(current_task_info["end"]),
-                        },
-                    )
+                if start_date == end_date:
+                    end_date = end_date + timedelta(days=1)
+                    if debug_logging:
+                        logger.debug(
+                            operation="prepare_gantt_data",
+                            message=f"Task {tm_id} (done): End date adjusted by 1 day for visibility: {end_date}",
+                            context={"task_id": tm_id, "start_date": start_date.isoformat(), "end_date": end_date.isoformat()},
+                        )
+                task_dates[tm_id] = {"start": start_date, "end": end_date}
                 continue  # Skip further ASAP logic for done tasks
 
             # --- 2. Handle non-done tasks: apply ASAP logic ---
             earliest_possible_start = None
 
             # Prioritize task's own created_at if it's an independent task
-            if not tm_task.get("dependencies") and issue and issue.created_at:
-                task_created_at = datetime.fromisoformat(issue.created_at).date()
+            if not tm_task.get("dependencies") and created_date:
                 if overall_start_date:
                     # Use the later of task_created_at and overall_start_date
-                    earliest_possible_start = max(task_created_at, overall_start_date)
+                    earliest_possible_start = max(created_date, overall_start_date)
                 else:
-                    earliest_possible_start = task_created_at
+                    earliest_possible_start = created_date
 
-            # If dependencies exist, or no specific created_at for independent task, calculate based on dependencies
-            if tm_task.get("dependencies"):
-                max_dep_end_date = None
-                for dep_id in tm_task["dependencies"]:
-                    dep_dates = task_dates.get(str(dep_id))
-                    if dep_dates and dep_dates["end"]:
-                        if max_dep_end_date is None or dep_dates["end"] > max_dep_end_date:
-                            max_dep_end_date = dep_dates["end"]
+            # If dependencies exist, start after the already finalized end dates of the dependencies
+            dep_based_start = dep_based_starts.get(tm_id)
+            if dep_based_start and (earliest_possible_start is None or dep_based_start > earliest_possible_start):
+                earliest_possible_start = dep_based_start
 
-                if max_dep_end_date:
-                    dep_based_start = get_next_working_day(max_dep_end_date, country_holidays)
-                    if earliest_possible_start is None or dep_based_start > earliest_possible_start:
-                        earliest_possible_start = dep_based_start
-
-            # Fallback if no dependencies and no specific created_at, or if dependencies result in earlier date
+            # Fallback if no dependencies and no specific created_at
             if earliest_possible_start is None:
                 if overall_start_date:
                     earliest_possible_start = overall_start_date
@@ -313,125 +706,109 @@ def prepare_gantt_data(taskmaster_tasks, task_id_to_issue, overall_start_date, c
                 else:
                     earliest_possible_start = today  # Final Fallback
 
-            # Update current task's start date
-            if current_task_info["start"] is None or earliest_possible_start > current_task_info["start"]:
-                current_task_info["start"] = earliest_possible_start
+            start_date = earliest_possible_start
+            if debug_logging:
                 logger.debug(
                     operation="prepare_gantt_data",
-                    message=f"Task {tm_id}: Start date set to {current_task_info['start']}",
-                    context={"task_id": tm_id, "start_date": str(current_task_info["start"])}
+                    message=f"Task {tm_id}: Start date set to {start_date}",
+                    context={"task_id": tm_id, "start_date": start_date.isoformat()},
                 )
 
             # Ensure end_date is not before start_date (minimum 1 day duration)
-            if current_task_info["end"] < current_task_info["start"]:
-                current_task_info["end"] = current_task_info["start"] + timedelta(days=1)
+            if end_date < start_date:
+                end_date = start_date + timedelta(days=1)
                 logger.warning(
                     operation="prepare_gantt_data",
-                    message=f"Task {tm_id}: End date adjusted to {current_task_info['end']} to be >= start date.",
-                    context={
-                        "task_id": tm_id,
-                        "start_date": str(current_task_info["start"]),
-                        "end_date": str(current_task_info["end"]),
-                    },
-                )
-            elif current_task_info["end"] == current_task_info["start"]:
-                current_task_info["end"] = current_task_info["start"] + timedelta(days=1)
-                logger.debug(
-                    operation="prepare_gantt_data",
-                    message=f"Task {tm_id}: End date adjusted by 1 day as start and end were same.",
-                    context={
-                        "task_id": tm_id,
-                        "start_date": str(current_task_info["start"]),
-                        "end_date": str(current_task_info["end"]),
-                    },
+                    message=f"Task {tm_id}: End date adjusted to {end_date} to be >= start date.",
+                    context={"task_id": tm_id, "start_date": start_date.isoformat(), "end_date": end_date.isoformat()},
                 )
+            elif end_date == start_date:
+                end_date = start_date + timedelta(days=1)
+                if debug_logging:
+                    logger.debug(
+                        operation="prepare_gantt_data",
+                        message=f"Task {tm_id}: End date adjusted by 1 day as start and end were same.",
+                        context={"task_id": tm_id, "start_date": start_date.isoformat(), "end_date": end_date.isoformat()},
+                    )
+
+            task_dates[tm_id] = {"start": start_date, "end": end_date}
 
-    # Final pass: build DataFrame
+    # Task lists in the descriptions of the charted tasks' issues are parsed in one pass
+    sub_tasks_by_id = {
+        tm_id: parse_task_list(issue.description)
+        for tm_id, issue in task_id_to_issue.items()
+        if tm_id in taskmaster_tasks and issue.description
+    }
+
+    # Build DataFrame rows in Taskmaster order, which is the order of the chart's y-axis
     for tm_id, tm_task in taskmaster_tasks.items():
         start_date = task_dates[tm_id]["start"]
         end_date = task_dates[tm_id]["end"]
 
-        if start_date is None:
-            logger.warning(
-                operation="prepare_gantt_data",
-                message=f"Task {tm_id}: Start date could not be determined. Using today.",
-                context={"task_id": tm_id},
-            )
-            start_date = today
-        if end_date is None:
-            logger.warning(
-                operation="prepare_gantt_data",
-                message=f"Task {tm_id}: End date could not be determined. Using start_date + 7 days.",
-                context={"task_id": tm_id, "start_date": str(start_date)},
-            )
-            end_date = start_date + timedelta(days=7)
-
         status = tm_task.get("status", "unknown")
-        color_map = {
-            "done": "#28a745",
-            "in-progress": "#fd7e14",
-            "pending": "#007bff",
-            "blocked": "#dc3545",
-            "unknown": "#6c757d",
-        }
 
-        df_data.append(
-            dict(
-                Task=f"{tm_id}: {tm_task['title']}",
-                Start=start_date,
-                Finish=end_date,
-                Status=status,
-                Color=color_map.get(status, "#6c757d"),
-                TaskID=tm_id,  # Add TaskID for dependency drawing
+        # Row layout follows GANTT_COLUMNS; TaskID is used for dependency drawing.
+        # Task colors are left empty here and filled from COLOR_MAP once the DataFrame is built.
+        df_data.append((f"{tm_id}: {tm_task['title']}", start_date, end_date, status, None, tm_id))
+        if debug_logging:
+            logger.debug(
+                operation="prepare_gantt_data",
+                message=f"Task {tm_id}: Start={start_date}, End={end_date}, Status={status}",
+                context={"task_id": tm_id, "start": start_date.isoformat(), "end": end_date.isoformat(), "status": status},
             )
-        )
-        logger.debug(
-            operation="prepare_gantt_data",
-            message=f"Task {tm_id}: Start={start_date}, End={end_date}, Status={status}",
-            context={"task_id": tm_id, "start": str(start_date), "end": str(end_date), "status": status},
-        )
 
         # Subtasks from description
-        issue = task_id_to_issue.get(tm_id)
-        if issue and issue.description:
-            sub_tasks_from_desc = parse_task_list(issue.description)
-            for i, sub_t in enumerate(sub_tasks_from_desc):
+        if tm_id in sub_tasks_by_id:
+            for i, sub_t in enumerate(sub_tasks_by_id[tm_id]):
                 sub_task_name = f"{tm_id}.{i+1}: {sub_t['title']}"
                 sub_task_status = "done" if sub_t["completed"] else "pending"
-                sub_task_color = "#A0A0A0"  # Subtasks are gray
-
-                df_data.append(
-                    dict(
-                        Task=sub_task_name,
-                        Start=start_date,  # Simplified: same duration as parent
-                        Finish=end_date,  # Simplified: same duration as parent
-                        Status=sub_task_status,
-                        Color=sub_task_color,
-                        TaskID=f"{tm_id}.{i+1}",  # Add TaskID for subtasks
+
+                # Simplified: same duration as parent
+                df_data.append((sub_task_name, start_date, end_date, sub_task_status, SUBTASK_COLOR, f"{tm_id}.{i+1}"))
+                if debug_logging:
+                    logger.debug(
+                        operation="prepare_gantt_data",
+                        message=f"Subtask {sub_task_name}: Start={start_date}, End={end_date}, Status={sub_task_status}",
+                        context={
+                            "subtask_name": sub_task_name,
+                            "start": start_date.isoformat(),
+                            "end": end_date.isoformat(),
+                            "status": sub_task_status,
+                        },
                     )
-                )
-                logger.debug(
-                    operation="prepare_gantt_data",
-                    message=f"Subtask {sub_task_name}: Start={start_date}, End={end_date}, Status={sub_task_status}",
-                    context={
-                        "subtask_name": sub_task_name,
-                        "start": str(start_date),
-                        "end": str(end_date),
-                        "status": sub_task_status,
-                    },
-                )
 
     logger.info(
         operation="prepare_gantt_data",
         message=f"Prepared {len(df_data)} entries for Gantt chart.",
         context={"num_entries": len(df_data)},
     )
-    return pd.DataFrame(df_data)
+    df = pd.DataFrame.from_records(df_data, columns=GANTT_COLUMNS)
+    # Convert dates column-wise to datetime64 once instead of keeping per-row Python date objects
+    df["Start"] = pd.to_datetime(df["Start"])
+    df["Finish"] = pd.to_datetime(df["Finish"])
+    # Map status to color column-wise; subtask rows keep the color they were given
+    df["Color"] = df["Color"].fillna(df["Status"].map(COLOR_MAP)).fillna(UNKNOWN_STATUS_COLOR)
+    # Status and Color take only a handful of values. Categoricals store them as small integer codes, which
+    # also speeds up Plotly's grouping by Status. Categories keep their order of appearance (the legend order).
+    for column in ("Status", "Color"):
+        df[column] = pd.Categorical(df[column], categories=df[column].unique())
+    return df
 
 
 # --- Chart Generation Module ---
 
 
+def get_chart_inputs_hash(df, taskmaster_tasks, output_format, project_name, holiday_days, inline_plotlyjs):
+    """Returns a hash of everything the rendered chart depends on, used to skip re-rendering unchanged charts."""
+    task_dependencies = {tm_id: tm_task.get("dependencies") or [] for tm_id, tm_task in taskmaster_tasks.items()}
+    settings = [output_format, project_name, inline_plotlyjs, np.datetime_as_string(holiday_days).tolist()]
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(df.to_csv(index=False).encode("utf-8"))
+    digest.update(json.dumps([task_dependencies, settings], sort_keys=True, default=str).encode("utf-8"))
+    digest.update(Path(__file__).read_bytes())  # A change in the chart code invalidates earlier output too
+    return digest.hexdigest()
+
+
 def generate_gantt_chart(
     df,
     output_path,
@@ -439,173 +816,202 @@ def generate_gantt_chart(
     dry_run,
     output_format,
     project_name,
-    country_holidays,
+    holiday_days,
+    inline_plotlyjs=False,
+    use_cache=True,
 ):
-    """Generates and saves the Gantt chart HTML file using Plotly."""
+    """Generates and saves the Gantt chart HTML file using Plotly.
+
+    HTML output loads plotly.js from the CDN unless `inline_plotlyjs` is True, in which case
+    the full plotly.js bundle (~3.5 MB) is embedded so the file also works offline.
+    A hash of the chart inputs is stored next to the output (`<output>.sha`); if the output exists and the
+    hash matches, rendering is skipped unless `use_cache` is False.
+    """
     if df.empty:
         logger.warning(operation="generate_gantt_chart", message="DataFrame is empty. Cannot generate chart.")
         return
 
+    # Nothing is written in a dry run, so the figure, shapes and arrows are not built at all
+    if dry_run:
+        logger.info(
+            operation="generate_gantt_chart",
+            message=f"Dry run: Gantt chart would have been saved to: {output_path} (format: {output_format})",
+            context={"output_path": str(output_path), "format": output_format, "dry_run": True},
+        )
+        return
+
+    output_path = Path(output_path)
+    inputs_hash_path = Path(f"{output_path}{CHART_HASH_SUFFIX}")
+    inputs_hash = get_chart_inputs_hash(df, taskmaster_tasks, output_format, project_name, holiday_days, inline_plotlyjs)
+    if use_cache and output_path.exists():
+        try:
+            if inputs_hash_path.read_text(encoding="utf-8").strip() == inputs_hash:
+                logger.info(
+                    operation="generate_gantt_chart",
+                    message=f"Chart inputs unchanged. Keeping existing chart: {output_path}",
+                    context={"output_path": str(output_path), "inputs_hash": inputs_hash},
+                )
+                return
+        except OSError:
+            pass  # No readable hash file: render the chart
+
+    import plotly.express as px
+    import plotly.graph_objects as go
+
+    # Rows are shown top to bottom in DataFrame (Taskmaster) order. Without an explicit order, Plotly would
+    # group the rows by status because each status is drawn as a separate trace.
     fig = px.timeline(
         df,
         x_start="Start",
         x_end="Finish",
         y="Task",
         color="Status",
-        color_discrete_map={
-            "done": "#28a745",
-            "in-progress": "#fd7e14",
-            "pending": "#007bff",
-            "blocked": "#dc3545",
-            "unknown": "#6c757d",
-        },
+        color_discrete_map=COLOR_MAP,
+        category_orders={"Task": list(df["Task"].unique())},
         title=f"{project_name} Gantt Chart",  # Use project_name here
         labels={"Task": "Tasks"},
     )
 
-    fig.update_yaxes(autorange="reversed")
-
-    # Add non-working day shapes
-    start_of_chart = df["Start"].min() - timedelta(days=7)
-    end_of_chart = df["Finish"].max() + timedelta(days=7)
-    shapes = []
-    current_day = start_of_chart
-    while current_day <= end_of_chart:
-        if not is_working_day(current_day, country_holidays):
-            shapes.append(
-                go.layout.Shape(
-                    type="rect",
-                    xref="x",
-                    yref="paper",
-                    x0=current_day,
-                    y0=0,
-                    x1=current_day + timedelta(days=1),
-                    y1=1,
-                    fillcolor="rgba(0,0,0,0.05)",
-                    layer="below",
-                    line_width=0,
-                )
-            )
-        current_day += timedelta(days=1)
+    # Add non-working day shapes, one rectangle per run of consecutive non-working days
+    start_of_chart = (df["Start"].min() - timedelta(days=7)).date()
+    end_of_chart = (df["Finish"].max() + timedelta(days=7)).date()
+    # Plain dicts are validated once by update_layout; building go.layout.Shape objects first validates them twice
+    shapes = [
+        {
+            "type": "rect",
+            "xref": "x",
+            "yref": "paper",
+            "x0": period_start,
+            "y0": 0,
+            "x1": period_end,
+            "y1": 1,
+            "fillcolor": "rgba(0,0,0,0.05)",
+            "layer": "below",
+            "line": {"width": 0},
+        }
+        for period_start, period_end in get_non_working_periods(start_of_chart, end_of_chart, holiday_days)
+    ]
 
     fig.update_layout(shapes=shapes)
 
     # --- Dependency Arrow Drawing Logic (PoC Revisit) ---
-    # Get the actual order of tasks on the y-axis after Plotly renders them
-    # This is crucial because Plotly might reorder tasks based on various factors.
-    # We need to map TaskID to its numerical Y-axis position
-    # The y-axis labels are in the format "TaskID: Task Title"
-    # So, we extract TaskID from the ticktext
-    y_axis_task_labels = fig.layout.yaxis.ticktext
+    # A category axis places category i at y=i, and px.timeline stores the category order in categoryarray
+    # (bottom to top). fig.layout.yaxis.ticktext cannot be used for this because px.timeline leaves it unset.
+    label_positions = {label: i for i, label in enumerate(fig.layout.yaxis.categoryarray)}
+
+    # Index (Start, Finish) and row positions by TaskID in one pass so that each dependency lookup is O(1) and
+    # never touches the DataFrame; the first row wins like df[...].iloc[0]. The columns are converted to plain
+    # lists through NumPy once: datetime64 values become datetime objects in C instead of boxing a pandas
+    # Timestamp (or a namedtuple) per row.
+    starts = df["Start"].to_numpy(dtype="datetime64[us]").tolist()
+    finishes = df["Finish"].to_numpy(dtype="datetime64[us]").tolist()
+    row_by_task_id = {}
+    y_axis_position_map = {}
+    for task_id, label, start, finish in zip(df["TaskID"].tolist(), df["Task"].tolist(), starts, finishes):
+        if task_id not in row_by_task_id:
+            row_by_task_id[task_id] = (start, finish)
+            y_axis_position_map[task_id] = label_positions[label]
 
     annotations = []
-    if y_axis_task_labels is None or not y_axis_task_labels:  # Added check
-        logger.warning(
-            operation="generate_gantt_chart", message="No y-axis tick labels found. Skipping dependency arrow drawing."
-        )
-    else:
-        y_axis_task_ids = [label.split(": ", 1)[0] for label in y_axis_task_labels]
-        y_axis_position_map = {task_id: i for i, task_id in enumerate(y_axis_task_ids)}
+    for tm_id, tm_task in taskmaster_tasks.items():
+        if tm_task.get("dependencies"):
+            current_task_df_row = row_by_task_id.get(tm_id)
+            if current_task_df_row is None:
+                logger.warning(
+                    operation="generate_gantt_chart",
+                    message=f"Current task {tm_id} not found in DataFrame for dependency drawing.",
+                    context={"task_id": tm_id},
+                )
+                continue
 
-        for tm_id, tm_task in taskmaster_tasks.items():
-            if tm_task.get("dependencies"):
-                current_task_df_row = df[df["TaskID"] == tm_id]
-                if current_task_df_row.empty:
+            for dep_id in tm_task["dependencies"]:
+                dep_task_df_row = row_by_task_id.get(str(dep_id))
+                if dep_task_df_row is None:
                     logger.warning(
                         operation="generate_gantt_chart",
-                        message=f"Current task {tm_id} not found in DataFrame for dependency drawing.",
-                        context={"task_id": tm_id},
+                        message=f"Dependent task {dep_id} not found in DataFrame for dependency drawing.",
+                        context={"dependency_id": dep_id},
                     )
                     continue
-                current_task_df_row = current_task_df_row.iloc[0]
-
-                for dep_id in tm_task["dependencies"]:
-                    dep_task_df_row = df[df["TaskID"] == str(dep_id)]
-                    if dep_task_df_row.empty:
-                        logger.warning(
-                            operation="generate_gantt_chart",
-                            message=f"Dependent task {dep_id} not found in DataFrame for dependency drawing.",
-                            context={"dependency_id": dep_id},
-                        )
-                        continue
-                    dep_task_df_row = dep_task_df_row.iloc[0]
-
-                    # X-coordinates: from end of dependent task to start of current task
-                    x_start_arrow = dep_task_df_row["Finish"]
-                    x_end_arrow = current_task_df_row["Start"]
-
-                    # Y-coordinates: based on their position in the chart
-                    y_start_pos = y_axis_position_map.get(str(dep_id))
-                    y_end_pos = y_axis_position_map.get(tm_id)
-
-                    if y_start_pos is not None and y_end_pos is not None:
-                        # Adjust Y-position to be in the middle of the bar
-                        # Plotly's y-axis is categorical, so yref='y' uses category index
-                        # For arrows, we need to use 'y' for the actual position on the axis
-                        # The y-axis range is from -0.5 to N-0.5 for N categories
-                        # So, category 'i' is at y=i
-                        y_start_arrow = y_start_pos  # + 0.0 # Center of the bar
-                        y_end_arrow = y_end_pos  # + 0.0 # Center of the bar
-
-                        # Add a slight offset if tasks are on the same row to avoid overlap
-                        y_offset = 0.1  # Small offset for visual clarity
-                        if y_start_arrow == y_end_arrow:
-                            y_end_arrow += y_offset  # Shift end of arrow slightly down
-
-                        annotations.append(
-                            go.layout.Annotation(
-                                x=x_end_arrow,  # Arrow tip x
-                                y=y_end_arrow,  # Arrow tip y
-                                xref="x",
-                                yref="y",
-                                ax=x_start_arrow,  # Arrow tail x
-                                ay=y_start_arrow,  # Arrow tail y
-                                axref="x",
-                                ayref="y",
-                                showarrow=True,
-                                arrowhead=2,
-                                arrowsize=1,
-                                arrowwidth=1,
-                                arrowcolor="#000000",
-                                standoff=0,
-                                startstandoff=0,
-                            )
+
+                # X-coordinates: from end of dependent task to start of current task
+                x_start_arrow = dep_task_df_row[1]  # Finish
+                x_end_arrow = current_task_df_row[0]  # Start
+
+                # Y-coordinates: based on their position in the chart
+                y_start_pos = y_axis_position_map.get(str(dep_id))
+                y_end_pos = y_axis_position_map.get(tm_id)
+
+                if y_start_pos is not None and y_end_pos is not None:
+                    # Adjust Y-position to be in the middle of the bar
+                    # Plotly's y-axis is categorical, so yref='y' uses category index
+                    # For arrows, we need to use 'y' for the actual position on the axis
+                    # The y-axis range is from -0.5 to N-0.5 for N categories
+                    # So, category 'i' is at y=i
+                    y_start_arrow = y_start_pos  # + 0.0 # Center of the bar
+                    y_end_arrow = y_end_pos  # + 0.0 # Center of the bar
+
+                    # Add a slight offset if tasks are on the same row to avoid overlap
+                    y_offset = 0.1  # Small offset for visual clarity
+                    if y_start_arrow == y_end_arrow:
+                        y_end_arrow += y_offset  # Shift end of arrow slightly down
+
+                    annotations.append(
+                        go.layout.Annotation(
+                            x=x_end_arrow,  # Arrow tip x
+                            y=y_end_arrow,  # Arrow tip y
+                            xref="x",
+                            yref="y",
+                            ax=x_start_arrow,  # Arrow tail x
+                            ay=y_start_arrow,  # Arrow tail y
+                            axref="x",
+                            ayref="y",
+                            showarrow=True,
+                            arrowhead=2,
+                            arrowsize=1,
+                            arrowwidth=1,
+                            arrowcolor="#000000",
+                            standoff=0,
+                            startstandoff=0,
                         )
+                    )
     fig.update_layout(annotations=annotations)
 
-    if not dry_run:
-        if output_format == "html":
-            fig.write_html(str(output_path))
+    if output_format == "html":
+        fig.write_html(
+            str(output_path),
+            include_plotlyjs=True if inline_plotlyjs else "cdn",
+            include_mathjax=False,
+            full_html=True,
+            div_id="gantt",
+            validate=False,  # The figure was built through Plotly's validated API; skip re-validating it
+        )
+        inputs_hash_path.write_text(inputs_hash, encoding="utf-8")
+        logger.info(
+            operation="generate_gantt_chart",
+            message=f"Gantt chart saved to: {output_path}",
+            context={"output_path": str(output_path), "format": "html"},
+        )
+    elif output_format in ["png", "jpeg", "webp", "svg", "pdf"]:
+        try:
+            fig.write_image(str(output_path))
+            inputs_hash_path.write_text(inputs_hash, encoding="utf-8")
             logger.info(
                 operation="generate_gantt_chart",
                 message=f"Gantt chart saved to: {output_path}",
-                context={"output_path": str(output_path), "format": "html"},
+                context={"output_path": str(output_path), "format": output_format},
             )
-        elif output_format in ["png", "jpeg", "webp", "svg", "pdf"]:
-            try:
-                fig.write_image(str(output_path))
-                logger.info(
-                    operation="generate_gantt_chart",
-                    message=f"Gantt chart saved to: {output_path}",
-                    context={"output_path": str(output_path), "format": output_format},
-                )
-            except Exception as e:
-                logger.error(
-                    operation="generate_gantt_chart",
-                    message=f"Failed to save image to {output_path}. Ensure kaleido is installed: {e}",
-                    context={"output_path": str(output_path), "error": str(e)},
-                )
-        else:
+        except Exception as e:
             logger.error(
                 operation="generate_gantt_chart",
-                message=f"Unsupported output format: {output_format}",
-                context={"format": output_format},
+                message=f"Failed to save image to {output_path}. Ensure kaleido is installed: {e}",
+                context={"output_path": str(output_path), "error": str(e)},
             )
     else:
-        logger.info(
+        logger.error(
             operation="generate_gantt_chart",
-            message=f"Dry run: Gantt chart would have been saved to: {output_path} (format: {output_format})",
-            context={"output_path": str(output_path), "format": output_format, "dry_run": True},
+            message=f"Unsupported output format: {output_format}",
+            context={"format": output_format},
         )
 
 
@@ -639,13 +1045,21 @@ def main():
         choices=["html", "png", "jpeg", "webp", "svg", "pdf"],
         help="Specify the output format (html, png, jpeg, webp, svg, pdf). Requires kaleido for image formats.",
     )
+    parser.add_argument(
+        "--inline-plotlyjs",
+        action="store_true",
+        help="Embed plotly.js in the HTML output instead of loading it from the CDN (for offline viewing).",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore the local GitLab issue cache and the chart input hash; fetch all issues and render again.",
+    )
     args = parser.parse_args()
 
-    # VibeLogger handles its own configuration and output.
-    # We can set the minimum logging level for VibeLogger if needed,
-    # but for now, we'll let its internal config manage it.
-    # For example, to set a minimum level:
-    # vibe_config.min_level = args.log_level.upper()
+    # VibeLogger records every entry regardless of its level. The requested level is stored in its config
+    # and per-task debug entries check it through is_debug_logging_enabled().
+    vibe_config.log_level = args.log_level
 
     logger.info(operation="main", message="--- Starting Gantt Chart Generator ---")
     logger.info(operation="main", message=f"Current working directory: {os.getcwd()}")
@@ -675,17 +1089,6 @@ def main():
     gantt_start_date_str = config.get("GANTT_START_DATE")
     holiday_country = config.get("HOLIDAY_COUNTRY", "JP")  # Default to Japan
 
-    try:
-        country_holidays = holidays.CountryHoliday(holiday_country, years=date.today().year)
-        logger.info(operation="main", message=f"Using holidays for {holiday_country}.", context={"country": holiday_country})
-    except KeyError:
-        logger.warning(
-            operation="main",
-            message=f"Holiday country '{holiday_country}' not found. No holidays will be observed.",
-            context={"country": holiday_country},
-        )
-        country_holidays = {}
-
     gitlab_ssl_verify = True
     ssl_verify_str = config.get("GITLAB_SSL_VERIFY", "true")
     if ssl_verify_str.lower() in ("false", "0", "no"):
@@ -699,12 +1102,18 @@ def main():
         logger.critical(operation="main", message="Missing GitLab configuration in .env file. Aborting.")
         sys.exit(1)
 
-    # 2. Connect to GitLab
+    # Loading the Taskmaster file (disk) does not depend on GitLab, so it runs in the background while
+    # this thread logs in to GitLab and fetches the issues (network)
+    taskmaster_executor = ThreadPoolExecutor(max_workers=1)
+    taskmaster_future = taskmaster_executor.submit(load_taskmaster_tasks)
+    taskmaster_executor.shutdown(wait=False)  # The submitted load still runs to completion
+
+    # 2. Connect to GitLab (get_gitlab_issues authenticates only when the issue cache has to be refreshed)
+    import gitlab
+
     gl = None
     try:
         gl = gitlab.Gitlab(gitlab_base_url, private_token=gitlab_token, ssl_verify=gitlab_ssl_verify)  # Changed from gitlab_url
-        gl.auth()
-        logger.info(operation="main", message="Successfully authenticated with GitLab.")
     except Exception as e:
         logger.critical(operation="main", message=f"Failed to connect to GitLab: {e}. Aborting.", context={"error": str(e)})
         sys.exit(1)
@@ -717,7 +1126,7 @@ def main():
             logger.info(
                 operation="main",
                 message=f"Overall Gantt start date from .env: {overall_start_date}",
-                context={"start_date": str(overall_start_date)},
+                context={"start_date": overall_start_date.isoformat()},
             )
         except ValueError:
             logger.warning(
@@ -726,18 +1135,56 @@ def main():
                 context={"gantt_start_date_str": gantt_start_date_str},
             )
 
-    taskmaster_tasks = load_taskmaster_tasks()
+    gitlab_issues, project_name = get_gitlab_issues(gl, project_id, use_cache=not args.no_cache)  # Get project_name here
+    taskmaster_tasks = taskmaster_future.result()
+
     if not taskmaster_tasks:
         logger.critical(operation="main", message="No Taskmaster tasks loaded. Aborting.")
         sys.exit(1)
-
-    gitlab_issues, project_name = get_gitlab_issues(gl, project_id)  # Get project_name here
     if not gitlab_issues:
         logger.warning(operation="main", message="No GitLab issues fetched. Chart might be incomplete.")
 
     task_id_to_issue = map_tasks_and_issues(gitlab_issues)
+    # Issues whose task is not in Taskmaster are never charted, so they are dropped before any per-issue work
+    # (date parsing, holiday year range, task list parsing)
+    num_mapped_issues = len(task_id_to_issue)
+    task_id_to_issue = {tm_id: issue for tm_id, issue in task_id_to_issue.items() if tm_id in taskmaster_tasks}
+    if len(task_id_to_issue) < num_mapped_issues:
+        logger.info(
+            operation="main",
+            message=f"Ignoring {num_mapped_issues - len(task_id_to_issue)} GitLab issues without a matching Taskmaster task.",
+            context={"num_ignored_issues": num_mapped_issues - len(task_id_to_issue)},
+        )
+    issue_dates = parse_issue_dates(task_id_to_issue)
+
+    # The holiday calendar covers every year the chart can show: the issue dates, the configured start date
+    # and today (fallback end dates are a week from today), plus one more year for scheduled dates and padding.
+    # It is built once and compiled into a sorted datetime64[D] array, the form NumPy's business-day functions
+    # take, so the holidays library's lazy per-year population is never triggered again.
+    today = date.today()
+    chart_years = [today.year] + [d.year for dates in issue_dates.values() for d in dates if d]
+    if overall_start_date:
+        chart_years.append(overall_start_date.year)
+    holiday_years = range(min(chart_years), max(chart_years) + 2)
+    import holidays
+
+    try:
+        country_holidays = holidays.country_holidays(holiday_country, years=holiday_years)
+        holiday_days = np.array(sorted(country_holidays.keys()), dtype="datetime64[D]")
+        logger.info(
+            operation="main",
+            message=f"Using holidays for {holiday_country} ({holiday_years.start}-{holiday_years.stop - 1}).",
+            context={"country": holiday_country, "num_holidays": len(holiday_days)},
+        )
+    except (KeyError, NotImplementedError):  # Older holidays releases raise KeyError for unknown countries
+        logger.warning(
+            operation="main",
+            message=f"Holiday country '{holiday_country}' not found. No holidays will be observed.",
+            context={"country": holiday_country},
+        )
+        holiday_days = np.array([], dtype="datetime64[D]")
 
-    df = prepare_gantt_data(taskmaster_tasks, task_id_to_issue, overall_start_date, country_holidays)
+    df = prepare_gantt_data(taskmaster_tasks, task_id_to_issue, overall_start_date, holiday_days, issue_dates)
 
     # 4. Generate chart
     generate_gantt_chart(
@@ -747,7 +1194,9 @@ def main():
         args.dry_run,
         args.format,
         project_name,
-        country_holidays,
+        holiday_days,
+        inline_plotlyjs=args.inline_plotlyjs,
+        use_cache=not args.no_cache,
     )
 
     logger.info(operation="main", message="--- Gantt Chart Generation Finished ---")